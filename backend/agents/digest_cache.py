@@ -0,0 +1,99 @@
+"""
+Cache of complete research digests.
+
+Repeat requests for the same (topic, keywords, timeframe) within the TTL
+return the earlier digest instead of re-running the research graph. Hits
+are served from an in-process cache first, then from recent SearchHistory
+rows so the cache is shared across workers and survives restarts.
+"""
+
+import logging
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from cachetools import TTLCache
+from sqlalchemy import func, or_, select
+
+from backend.config import DIGEST_CACHE_TTL_SECONDS
+from backend.database import AsyncSessionLocal
+from backend.models import SearchHistory
+
+logger = logging.getLogger(__name__)
+
+
+_digests: TTLCache = TTLCache(maxsize=512, ttl=max(DIGEST_CACHE_TTL_SECONDS, 1))
+
+
+def _normalize_keywords(keywords: Optional[str]) -> str:
+    return (keywords or "").strip()
+
+
+def _cache_key(topic: str, keywords: Optional[str], timeframe_days: int) -> str:
+    """Build the cache key for a research request."""
+    raw = f"{topic.strip().lower()}|{_normalize_keywords(keywords)}|{timeframe_days}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(digest: Optional[dict]) -> bool:
+    """
+    Only reuse digests that fully succeeded and found something.
+
+    Any source or LLM failure is reported in "warning"; an empty digest is
+    more likely a transient upstream problem than a real answer.
+    """
+    if not digest or digest.get("warning"):
+        return False
+    return bool(digest["papers"]["count"] or digest["articles"]["count"])
+
+
+async def _lookup_history(topic: str, keywords: Optional[str], timeframe_days: int) -> Optional[dict]:
+    """Find a recent successful digest for the same request in search history."""
+    cutoff = datetime.utcnow() - timedelta(seconds=DIGEST_CACHE_TTL_SECONDS)
+    keywords = _normalize_keywords(keywords)
+
+    stmt = select(SearchHistory.results).where(
+        func.lower(SearchHistory.topic) == topic.strip().lower(),
+        SearchHistory.timeframe_days == timeframe_days,
+        SearchHistory.created_at > cutoff,
+        or_(SearchHistory.paper_count > 0, SearchHistory.article_count > 0)
+    )
+    if keywords:
+        stmt = stmt.where(SearchHistory.keywords == keywords)
+    else:
+        stmt = stmt.where(or_(SearchHistory.keywords.is_(None), SearchHistory.keywords == ""))
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt.order_by(SearchHistory.created_at.desc()).limit(5))
+        for results in result.scalars():
+            if _is_cacheable(results):
+                return results
+    return None
+
+
+async def get_cached_digest(topic: str, keywords: Optional[str], timeframe_days: int) -> Optional[dict]:
+    """Return a cached digest for the request, or None on a miss."""
+    if DIGEST_CACHE_TTL_SECONDS <= 0:
+        return None
+
+    key = _cache_key(topic, keywords, timeframe_days)
+    cached = _digests.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        cached = await _lookup_history(topic, keywords, timeframe_days)
+    except Exception as e:
+        logger.warning("History lookup error: %s", e)
+        return None
+
+    if cached is not None:
+        _digests[key] = cached
+    return cached
+
+
+def store_digest(topic: str, keywords: Optional[str], timeframe_days: int, digest: dict) -> None:
+    """Cache a completed digest; failed or empty digests are not cached."""
+    if DIGEST_CACHE_TTL_SECONDS <= 0 or not _is_cacheable(digest):
+        return
+    _digests[_cache_key(topic, keywords, timeframe_days)] = digest
@@ -0,0 +1,105 @@
+"""
+Response cache for LLM calls.
+
+Prompts are hashed and their responses stored in the `llm_cache` table, so
+re-running a topic (or seeing the same paper in another search) is served
+from the database instead of another round-trip to the model.
+"""
+
+import logging
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select
+
+from backend.config import LLM_CACHE_TTL_SECONDS
+from backend.database import AsyncSessionLocal
+from backend.models import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are deleted on write, at most once per interval per process
+PURGE_INTERVAL_SECONDS = 3600
+_last_purge: Optional[float] = None
+
+
+def _cache_key(prompt: str, template_id: str) -> str:
+    """Build the cache key for a prompt within a template namespace."""
+    return hashlib.sha256(f"{template_id}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def _cutoff() -> datetime:
+    """Oldest created_at that is still within the TTL."""
+    return datetime.utcnow() - timedelta(seconds=LLM_CACHE_TTL_SECONDS)
+
+
+async def _lookup(key: str) -> Optional[str]:
+    """Return the cached response for a key if it has not expired."""
+    cutoff = _cutoff()
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(LLMCacheEntry.response).where(
+                LLMCacheEntry.key == key,
+                LLMCacheEntry.created_at > cutoff
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def _store(key: str, response: str) -> None:
+    """Insert or refresh the cached response for a key, purging expired rows periodically."""
+    global _last_purge
+    now = time.monotonic()
+    purge = _last_purge is None or now - _last_purge >= PURGE_INTERVAL_SECONDS
+
+    async with AsyncSessionLocal() as db:
+        await db.merge(LLMCacheEntry(key=key, response=response, created_at=datetime.utcnow()))
+        if purge:
+            await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.created_at <= _cutoff()))
+        await db.commit()
+
+    if purge:
+        _last_purge = now
+
+
+async def cached_ainvoke(
+    llm,
+    prompt: str,
+    template_id: str = "default",
+    validate: Optional[Callable[[str], bool]] = None
+) -> str:
+    """
+    Invoke the LLM with a prompt, reusing a cached response when available.
+
+    Returns the response content. When `validate` is given, only content it
+    accepts is cached or served from the cache, so a malformed completion is
+    retried next time instead of being pinned for the TTL. Cache failures
+    never block the LLM call.
+    """
+    if LLM_CACHE_TTL_SECONDS <= 0:
+        response = await llm.ainvoke(prompt)
+        return response.content
+
+    key = _cache_key(prompt, template_id)
+
+    try:
+        cached = await _lookup(key)
+        if cached is not None and (validate is None or validate(cached)):
+            return cached
+    except Exception as e:
+        logger.warning("Lookup error: %s", e)
+
+    response = await llm.ainvoke(prompt)
+    content = response.content
+
+    if validate is not None and not validate(content):
+        return content
+
+    try:
+        await _store(key, content)
+    except Exception as e:
+        logger.warning("Store error: %s", e)
+
+    return content
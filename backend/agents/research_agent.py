@@ -3,28 +3,52 @@ Research Agent using LangGraph for orchestrating ArXiv and Tavily searches.
 
 Workflow:
 1. Parallel search: ArXiv papers + Tavily articles
-2. Summarize papers with AI (problem/solution/challenges)
+2. Summarize papers with AI (problem/solution/challenges) as they stream in
 3. Generate executive summaries for both papers and articles
 """
 
+import logging
 import asyncio
 from datetime import datetime, timezone
-from typing import TypedDict, List, Optional
-from dataclasses import asdict
+from typing import Annotated, TypedDict, List, Optional
+from dataclasses import fields
+from functools import lru_cache
+from weakref import WeakKeyDictionary
 
+import httpx
+import orjson
 from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
+from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableConfig
 
-from backend.config import OPENAI_API_KEY, LANGCHAIN_TRACING_V2
+from backend.config import OPENAI_API_KEY, LANGCHAIN_TRACING_V2, LLM_MAX_CONCURRENCY, LLM_TIMEOUT_SECONDS
+from backend.agents.digest_cache import get_cached_digest, store_digest
+from backend.agents.llm_cache import cached_ainvoke
 from backend.services.arxiv import arxiv_service, ArxivPaper
+from backend.services.http_client import get_http_client
 from backend.services.tavily_search import tavily_service, Article
 
+logger = logging.getLogger(__name__)
+
+
+# Field names used to shallow-copy service dataclasses into state dicts
+# (dataclasses.asdict deep-copies every value, which is unnecessary here)
+_PAPER_FIELDS = tuple(f.name for f in fields(ArxivPaper))
+_ARTICLE_FIELDS = tuple(f.name for f in fields(Article))
+
 
 # =============================================================================
 # State Definition
 # =============================================================================
 
+def _merge_errors(existing: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Combine errors reported by parallel branches into one warning."""
+    if existing and new:
+        return f"{existing}; {new}"
+    return new or existing
+
+
 class ResearchState(TypedDict):
     """State for the research agent workflow."""
     topic: str
@@ -34,7 +58,8 @@ class ResearchState(TypedDict):
     articles: List[dict]
     paper_executive_summary: str
     article_executive_summary: str
-    error: Optional[str]
+    # ArXiv and Tavily branches run concurrently and may both report errors
+    error: Annotated[Optional[str], _merge_errors]
 
 
 # =============================================================================
@@ -42,11 +67,21 @@ class ResearchState(TypedDict):
 # =============================================================================
 
 def get_llm(run_name: str = "openai-research"):
-    """Get the OpenAI LLM instance with tracing metadata."""
+    """Get the OpenAI LLM instance with tracing metadata (one per run name)."""
+    # Resolve the shared client on every call so LLMs built before a
+    # shutdown never hold on to a closed client
+    return _build_llm(run_name, get_http_client())
+
+
+@lru_cache(maxsize=16)
+def _build_llm(run_name: str, http_client: httpx.AsyncClient):
+    """Build an LLM bound to a specific HTTP client (memoized per client)."""
     llm = ChatOpenAI(
         model="gpt-4o-mini",
         api_key=OPENAI_API_KEY,
-        temperature=0.1
+        temperature=0.1,
+        timeout=LLM_TIMEOUT_SECONDS,
+        http_async_client=http_client
     )
     return llm.with_config(
         run_name=run_name,
@@ -54,43 +89,199 @@ def get_llm(run_name: str = "openai-research"):
     )
 
 
+# =============================================================================
+# Prompt Templates
+# =============================================================================
+
+# Per-item truncation for executive-summary context
+MAX_TITLE_CHARS = 120
+MAX_ABSTRACT_CHARS = 300
+
+PAPER_SUMMARY_PROMPT = PromptTemplate.from_template("""Analyze this research paper and provide a structured summary.
+
+Title: {title}
+Authors: {authors}
+Abstract: {abstract}
+
+Provide a JSON response with exactly these three fields:
+- problem_statement: What specific problem or challenge does this paper address? (1-2 sentences)
+- proposed_solution: What is the main approach, method, or contribution proposed? (1-2 sentences)
+- challenges: What limitations, challenges, or future work are mentioned? (1-2 sentences)
+
+Only use information explicitly stated in the abstract. If something is not mentioned, say "Not specified in abstract."
+
+Respond with ONLY valid JSON, no markdown formatting.""")
+
+PAPER_EXECUTIVE_SUMMARY_PROMPT = PromptTemplate.from_template("""You are a research analyst. Based on the following {count} academic papers about "{topic}", provide a concise executive summary (3-4 paragraphs) that:
+
+1. Identifies the main themes and research directions
+2. Highlights the most significant findings or contributions
+3. Notes any emerging trends or patterns across the papers
+
+Papers:
+{papers_list}
+
+Write a clear, professional summary suitable for executives or researchers wanting a quick overview.""")
+
+ARTICLE_EXECUTIVE_SUMMARY_PROMPT = PromptTemplate.from_template("""You are a technology news analyst. Based on the following {count} articles about "{topic}", provide a concise executive summary (2-3 paragraphs) that:
+
+1. Summarizes the key news and developments
+2. Identifies any significant announcements or trends
+3. Notes the overall industry sentiment or direction
+
+Articles:
+{articles_list}
+
+Write a clear, professional summary suitable for executives or professionals wanting a quick industry overview.""")
+
+
 # =============================================================================
 # Agent Nodes
 # =============================================================================
 
-async def fetch_papers(state: ResearchState) -> dict:
-    """Fetch papers from ArXiv."""
-    print(f"[ResearchAgent] Fetching papers for: {state['topic']}")
+_SUMMARY_UNAVAILABLE = {
+    "problem_statement": "Summary unavailable.",
+    "proposed_solution": "Summary unavailable.",
+    "challenges": "Summary unavailable."
+}
+
+# Caps in-flight summarization calls so a large batch stays under the
+# provider's rate limit. A semaphore binds to the first loop that waits on
+# it, so keep one per event loop (e.g. across repeated asyncio.run calls)
+_summarize_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+
+def _get_summarize_semaphore() -> asyncio.Semaphore:
+    """Get the running loop's semaphore limiting concurrent LLM summarization calls."""
+    loop = asyncio.get_running_loop()
+    semaphore = _summarize_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _summarize_semaphores[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return semaphore
+
+
+def _parse_json_object(content: str) -> Optional[dict]:
+    """Parse the outermost JSON object in an LLM response, or return None."""
+    content = content.strip()
+
+    # Fast path: the model returned bare JSON as instructed
+    if not (content.startswith("{") and content.endswith("}")):
+        # Otherwise trim any surrounding prose or markdown fences
+        start = content.find("{")
+        end = content.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        content = content[start:end + 1]
 
     try:
-        raw_papers = await arxiv_service.search_papers(
+        parsed = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return None
+
+    return parsed if isinstance(parsed, dict) else None
+
+
+async def _summarize_one(llm, paper: dict) -> dict:
+    """Generate the structured AI summary for a single paper; raises if it can't be parsed."""
+    prompt = PAPER_SUMMARY_PROMPT.format(
+        title=paper["title"],
+        authors=paper["authors"],
+        abstract=paper["abstract"]
+    )
+
+    async with _get_summarize_semaphore():
+        content = await cached_ainvoke(
+            llm,
+            prompt,
+            template_id="paper-summary",
+            validate=lambda c: _parse_json_object(c) is not None
+        )
+
+    parsed = _parse_json_object(content)
+    if parsed is None:
+        raise ValueError("LLM response was not a JSON object")
+
+    paper["summary"] = {
+        "problem_statement": parsed.get("problem_statement", "Not specified."),
+        "proposed_solution": parsed.get("proposed_solution", "Not specified."),
+        "challenges": parsed.get("challenges", "Not specified.")
+    }
+    return paper
+
+
+async def fetch_and_summarize_papers(state: ResearchState) -> dict:
+    """
+    Fetch papers from ArXiv and summarize them as they stream in.
+
+    Each paper is handed to its own summarization task as soon as its entry
+    is parsed, so LLM calls overlap with the rest of the ArXiv download.
+    The executive summary only needs titles and abstracts, so it is generated
+    alongside the per-paper summaries rather than after them.
+    """
+    logger.info("Fetching papers for: %s", state["topic"])
+    if LANGCHAIN_TRACING_V2.lower() == "true":
+        logger.info("LangSmith tracing active for paper summarization")
+
+    llm = get_llm("paper-summarizer")
+    papers = []
+    tasks = []
+    errors = []
+
+    try:
+        async for paper in arxiv_service.stream_papers(
             topic=state["topic"],
             keywords=state.get("keywords"),
             days=state["timeframe_days"]
-        )
-
-        # Convert to dict format with empty summaries
-        papers = []
-        for paper in raw_papers:
-            paper_dict = asdict(paper)
+        ):
+            paper_dict = {name: getattr(paper, name) for name in _PAPER_FIELDS}
             paper_dict["summary"] = {
                 "problem_statement": "",
                 "proposed_solution": "",
                 "challenges": ""
             }
             papers.append(paper_dict)
-
-        print(f"[ResearchAgent] Found {len(papers)} papers")
-        return {"papers": papers}
+            tasks.append(asyncio.create_task(_summarize_one(llm, paper_dict)))
 
     except Exception as e:
-        print(f"[ResearchAgent] Error fetching papers: {e}")
-        return {"papers": [], "error": str(e)}
+        logger.error("Error fetching papers: %s", e)
+        errors.append(f"ArXiv search failed: {e}")
+
+    logger.info("Found %d papers, waiting on summaries", len(papers))
+    executive_summary_task = asyncio.create_task(
+        generate_paper_executive_summary({**state, "papers": papers})
+    )
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    summarized_papers = []
+    failed = 0
+    for paper, result in zip(papers, results):
+        if isinstance(result, Exception):
+            logger.error("Error summarizing paper %s: %s", paper["id"], result)
+            paper["summary"] = dict(_SUMMARY_UNAVAILABLE)
+            result = paper
+            failed += 1
+        summarized_papers.append(result)
+
+    if failed:
+        errors.append(f"{failed} of {len(papers)} paper summaries could not be generated")
+
+    logger.info("Summarized %d papers", len(summarized_papers) - failed)
+    executive_summary = await executive_summary_task
+    if executive_summary.get("error"):
+        errors.append(executive_summary["error"])
+
+    update = {
+        "papers": summarized_papers,
+        "paper_executive_summary": executive_summary["paper_executive_summary"]
+    }
+    if errors:
+        update["error"] = "; ".join(errors)
+    return update
 
 
 async def fetch_articles(state: ResearchState) -> dict:
     """Fetch articles from Tavily."""
-    print(f"[ResearchAgent] Fetching articles for: {state['topic']}")
+    logger.info("Fetching articles for: %s", state["topic"])
 
     try:
         raw_articles = await tavily_service.search_articles(
@@ -100,149 +291,81 @@ async def fetch_articles(state: ResearchState) -> dict:
         )
 
         # Convert to dict format
-        articles = [asdict(article) for article in raw_articles]
+        articles = [
+            {name: getattr(article, name) for name in _ARTICLE_FIELDS}
+            for article in raw_articles
+        ]
 
-        print(f"[ResearchAgent] Found {len(articles)} articles")
+        logger.info("Found %d articles", len(articles))
         return {"articles": articles}
 
     except Exception as e:
-        print(f"[ResearchAgent] Error fetching articles: {e}")
-        return {"articles": [], "error": str(e)}
-
-
-async def summarize_papers(state: ResearchState) -> dict:
-    """Generate AI summaries for each paper."""
-    print(f"[ResearchAgent] Summarizing {len(state['papers'])} papers")
-    if LANGCHAIN_TRACING_V2.lower() == "true":
-        print("[ResearchAgent] LangSmith tracing active for paper summarization")
-
-    if not state["papers"]:
-        return {"papers": []}
-
-    llm = get_llm("paper-summarizer")
-    summarized_papers = []
-
-    for paper in state["papers"]:
-        try:
-            prompt = f"""Analyze this research paper and provide a structured summary.
-
-Title: {paper['title']}
-Authors: {paper['authors']}
-Abstract: {paper['abstract']}
-
-Provide a JSON response with exactly these three fields:
-- problem_statement: What specific problem or challenge does this paper address? (1-2 sentences)
-- proposed_solution: What is the main approach, method, or contribution proposed? (1-2 sentences)
-- challenges: What limitations, challenges, or future work are mentioned? (1-2 sentences)
-
-Only use information explicitly stated in the abstract. If something is not mentioned, say "Not specified in abstract."
-
-Respond with ONLY valid JSON, no markdown formatting."""
-
-            response = await llm.ainvoke(prompt)
-            content = response.content
-
-            # Parse JSON from response
-            import json
-            import re
-
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                paper["summary"] = {
-                    "problem_statement": parsed.get("problem_statement", "Not specified."),
-                    "proposed_solution": parsed.get("proposed_solution", "Not specified."),
-                    "challenges": parsed.get("challenges", "Not specified.")
-                }
-            else:
-                paper["summary"] = {
-                    "problem_statement": "Summary unavailable.",
-                    "proposed_solution": "Summary unavailable.",
-                    "challenges": "Summary unavailable."
-                }
-
-            summarized_papers.append(paper)
-
-            # Small delay between API calls
-            await asyncio.sleep(0.3)
-
-        except Exception as e:
-            print(f"[ResearchAgent] Error summarizing paper {paper['id']}: {e}")
-            paper["summary"] = {
-                "problem_statement": "Summary unavailable.",
-                "proposed_solution": "Summary unavailable.",
-                "challenges": "Summary unavailable."
-            }
-            summarized_papers.append(paper)
-
-    print(f"[ResearchAgent] Summarized {len(summarized_papers)} papers")
-    return {"papers": summarized_papers}
+        logger.error("Error fetching articles: %s", e)
+        return {"articles": [], "error": f"Article search failed: {e}"}
 
 
 async def generate_paper_executive_summary(state: ResearchState) -> dict:
-    """Generate executive summary for all papers."""
-    print("[ResearchAgent] Generating paper executive summary")
+    """Generate executive summary for all papers from their titles and abstracts."""
+    logger.info("Generating paper executive summary")
 
     if not state["papers"]:
         return {"paper_executive_summary": "No papers found for this topic and timeframe."}
 
     llm = get_llm("paper-executive-summary")
 
-    papers_list = "\n".join([
-        f"{i+1}. \"{p['title']}\" - {p['summary'].get('problem_statement', 'N/A')}"
+    # Bounded per-item context keeps token counts predictable and the
+    # prompt stable for caching
+    papers_list = "\n".join(
+        f"{i+1}. \"{p['title'][:MAX_TITLE_CHARS]}\" - {p['abstract'][:MAX_ABSTRACT_CHARS]}"
         for i, p in enumerate(state["papers"])
-    ])
-
-    prompt = f"""You are a research analyst. Based on the following {len(state['papers'])} academic papers about "{state['topic']}", provide a concise executive summary (3-4 paragraphs) that:
-
-1. Identifies the main themes and research directions
-2. Highlights the most significant findings or contributions
-3. Notes any emerging trends or patterns across the papers
-
-Papers:
-{papers_list}
+    )
 
-Write a clear, professional summary suitable for executives or researchers wanting a quick overview."""
+    prompt = PAPER_EXECUTIVE_SUMMARY_PROMPT.format(
+        count=len(state["papers"]),
+        topic=state["topic"],
+        papers_list=papers_list
+    )
 
     try:
-        response = await llm.ainvoke(prompt)
-        return {"paper_executive_summary": response.content}
+        content = await cached_ainvoke(llm, prompt, template_id="paper-executive-summary")
+        return {"paper_executive_summary": content}
     except Exception as e:
-        print(f"[ResearchAgent] Error generating paper summary: {e}")
-        return {"paper_executive_summary": "Executive summary generation failed."}
+        logger.error("Error generating paper summary: %s", e)
+        return {
+            "paper_executive_summary": "Executive summary generation failed.",
+            "error": "Paper executive summary generation failed"
+        }
 
 
 async def generate_article_executive_summary(state: ResearchState) -> dict:
     """Generate executive summary for all articles."""
-    print("[ResearchAgent] Generating article executive summary")
+    logger.info("Generating article executive summary")
 
     if not state["articles"]:
         return {"article_executive_summary": "No articles found for this topic and timeframe."}
 
     llm = get_llm("article-executive-summary")
 
-    articles_list = "\n".join([
-        f"{i+1}. \"{a['title']}\" ({a['source']})"
+    articles_list = "\n".join(
+        f"{i+1}. \"{a['title'][:MAX_TITLE_CHARS]}\" ({a['source']})"
         for i, a in enumerate(state["articles"])
-    ])
-
-    prompt = f"""You are a technology news analyst. Based on the following {len(state['articles'])} articles about "{state['topic']}", provide a concise executive summary (2-3 paragraphs) that:
-
-1. Summarizes the key news and developments
-2. Identifies any significant announcements or trends
-3. Notes the overall industry sentiment or direction
-
-Articles:
-{articles_list}
+    )
 
-Write a clear, professional summary suitable for executives or professionals wanting a quick industry overview."""
+    prompt = ARTICLE_EXECUTIVE_SUMMARY_PROMPT.format(
+        count=len(state["articles"]),
+        topic=state["topic"],
+        articles_list=articles_list
+    )
 
     try:
-        response = await llm.ainvoke(prompt)
-        return {"article_executive_summary": response.content}
+        content = await cached_ainvoke(llm, prompt, template_id="article-executive-summary")
+        return {"article_executive_summary": content}
     except Exception as e:
-        print(f"[ResearchAgent] Error generating article summary: {e}")
-        return {"article_executive_summary": "Executive summary generation failed."}
+        logger.error("Error generating article summary: %s", e)
+        return {
+            "article_executive_summary": "Executive summary generation failed.",
+            "error": "Article executive summary generation failed"
+        }
 
 
 # =============================================================================
@@ -254,19 +377,16 @@ def build_research_graph():
     workflow = StateGraph(ResearchState)
 
     # Add nodes
-    workflow.add_node("fetch_papers", fetch_papers)
+    workflow.add_node("fetch_and_summarize_papers", fetch_and_summarize_papers)
     workflow.add_node("fetch_articles", fetch_articles)
-    workflow.add_node("summarize_papers", summarize_papers)
-    workflow.add_node("generate_paper_summary", generate_paper_executive_summary)
     workflow.add_node("generate_article_summary", generate_article_executive_summary)
 
-    # Define edges - parallel fetching, then summarization
-    workflow.add_edge(START, "fetch_papers")
+    # Define edges - parallel fetching (papers are summarized as they stream in,
+    # with their executive summary generated alongside)
+    workflow.add_edge(START, "fetch_and_summarize_papers")
     workflow.add_edge(START, "fetch_articles")
-    workflow.add_edge("fetch_papers", "summarize_papers")
-    workflow.add_edge("summarize_papers", "generate_paper_summary")
     workflow.add_edge("fetch_articles", "generate_article_summary")
-    workflow.add_edge("generate_paper_summary", END)
+    workflow.add_edge("fetch_and_summarize_papers", END)
     workflow.add_edge("generate_article_summary", END)
 
     return workflow.compile()
@@ -282,9 +402,14 @@ async def run_research_agent(
     keywords: Optional[str] = None
 ) -> dict:
     """Run the research agent and return results."""
-    print(f"[ResearchAgent] Starting research for: '{topic}'")
+    cached = await get_cached_digest(topic, keywords, timeframe_days)
+    if cached is not None:
+        logger.info("Serving cached digest for: '%s'", topic)
+        return cached
+
+    logger.info("Starting research for: '%s'", topic)
     if LANGCHAIN_TRACING_V2.lower() == "true":
-        print("[ResearchAgent] LangSmith tracing enabled - traces visible at smith.langchain.com")
+        logger.info("LangSmith tracing enabled - traces visible at smith.langchain.com")
 
     graph = build_research_graph()
 
@@ -313,7 +438,19 @@ async def run_research_agent(
     try:
         result = await graph.ainvoke(initial_state, config=run_config)
 
-        # Transform to API response format
+        # Transform to API response format by renaming keys in place
+        # rather than copying every paper and article into new dicts
+        for p in result["papers"]:
+            p["arxivUrl"] = p.pop("arxiv_url")
+            p["publishedDate"] = p.pop("published_date")
+            s = p["summary"]
+            s["problemStatement"] = s.pop("problem_statement")
+            s["proposedSolution"] = s.pop("proposed_solution")
+
+        for a in result["articles"]:
+            a["publishedDate"] = a.pop("published_date", None)
+            a.pop("content", None)  # Raw page text is not part of the response
+
         response = {
             "topic": result["topic"],
             "timeframeDays": result["timeframe_days"],
@@ -321,46 +458,26 @@ async def run_research_agent(
             "papers": {
                 "executiveSummary": result["paper_executive_summary"],
                 "count": len(result["papers"]),
-                "items": [
-                    {
-                        "id": p["id"],
-                        "title": p["title"],
-                        "authors": p["authors"],
-                        "arxivUrl": p["arxiv_url"],
-                        "publishedDate": p["published_date"],
-                        "abstract": p["abstract"],
-                        "categories": p["categories"],
-                        "summary": {
-                            "problemStatement": p["summary"]["problem_statement"],
-                            "proposedSolution": p["summary"]["proposed_solution"],
-                            "challenges": p["summary"]["challenges"]
-                        }
-                    }
-                    for p in result["papers"]
-                ]
+                "items": result["papers"]
             },
             "articles": {
                 "executiveSummary": result["article_executive_summary"],
                 "count": len(result["articles"]),
-                "items": [
-                    {
-                        "id": a["id"],
-                        "title": a["title"],
-                        "url": a["url"],
-                        "source": a["source"],
-                        "publishedDate": a.get("published_date")
-                    }
-                    for a in result["articles"]
-                ]
+                "items": result["articles"]
             },
             "warning": result.get("error")
         }
 
-        print(f"[ResearchAgent] Complete. Papers: {response['papers']['count']}, Articles: {response['articles']['count']}")
+        logger.info(
+            "Complete. Papers: %d, Articles: %d",
+            response["papers"]["count"],
+            response["articles"]["count"]
+        )
+        store_digest(topic, keywords, timeframe_days, response)
         return response
 
     except Exception as e:
-        print(f"[ResearchAgent] Error: {e}")
+        logger.exception("Research failed: %s", e)
         return {
             "topic": topic,
             "timeframeDays": timeframe_days,
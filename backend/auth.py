@@ -4,16 +4,24 @@ Authentication module for Research Lens.
 Provides user registration, login, logout, and session management.
 """
 
+import logging
+import asyncio
+import os
 import uuid
 import secrets
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 
 import bcrypt
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, Response, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database import get_db
+from backend.database import get_async_db
 from backend.models import User, UserSession
 from backend.schemas import (
     LoginRequest,
@@ -22,11 +30,33 @@ from backend.schemas import (
     UserResponse
 )
 from backend.config import SESSION_EXPIRY_DAYS
+from backend.services.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated user identity resolved from the session cookie."""
+    id: str
+    email: str
+
+
+# Recently validated sessions: token -> (user_id, email, expires_at).
+# When Redis is configured it is the only session cache, so a logout on one
+# worker reaches all of them. Otherwise this in-process cache lets repeat
+# requests skip the database; its short TTL bounds how long another worker
+# can keep accepting a logged-out token.
+_session_cache: TTLCache = TTLCache(maxsize=10000, ttl=10)
+
+# Redis entries are re-checked against the database at least this often, so
+# a lookup racing a logout can't re-cache the session for its whole lifetime
+REDIS_SESSION_TTL_SECONDS = 300
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
@@ -42,31 +72,113 @@ def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 
+# bcrypt releases the GIL, so a pool sized to the CPU count lets logins
+# hash in parallel without blocking the event loop or the default executor
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify a password on the bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, verify_password, password, hashed)
+
+
+# Checked against on unknown emails so login takes the same time whether or
+# not the account exists
+_DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
+
 def create_session_token() -> str:
     """Generate a secure session token."""
     return secrets.token_urlsafe(32)
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> Optional[User]:
+def _session_key(session_token: str) -> str:
+    return f"sess:{session_token}"
+
+
+async def _cache_session(session_token: str, user_id: str, email: str, expires_at: datetime) -> None:
+    """Remember a valid session in Redis (briefly) or, without Redis, locally."""
+    if not redis_client:
+        _session_cache[session_token] = (user_id, email, expires_at)
+        return
+
+    remaining = int((expires_at - datetime.utcnow()).total_seconds())
+    ttl = min(remaining, REDIS_SESSION_TTL_SECONDS)
+    if ttl > 0:
+        try:
+            value = orjson.dumps([user_id, email, expires_at.isoformat()])
+            await redis_client.setex(_session_key(session_token), ttl, value)
+        except Exception as e:
+            logger.warning("Redis session store error: %s", e)
+
+
+async def _get_cached_session(session_token: str) -> Optional[tuple]:
+    """Look up a session in Redis, or in the local cache without Redis."""
+    if not redis_client:
+        return _session_cache.get(session_token)
+
+    try:
+        raw = await redis_client.get(_session_key(session_token))
+    except Exception as e:
+        logger.warning("Redis session lookup error: %s", e)
+        return None
+
+    if not raw:
+        return None
+
+    user_id, email, expires_at = orjson.loads(raw)
+    return (user_id, email, datetime.fromisoformat(expires_at))
+
+
+async def _forget_session(session_token: str) -> None:
+    """Drop a session from the local cache and Redis."""
+    _session_cache.pop(session_token, None)
+
+    if redis_client:
+        try:
+            await redis_client.delete(_session_key(session_token))
+        except Exception as e:
+            logger.warning("Redis session delete error: %s", e)
+
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_db)) -> Optional[CurrentUser]:
     """Get the current user from session cookie."""
     session_token = request.cookies.get("session_token")
     if not session_token:
         return None
 
-    session = db.query(UserSession).filter(
-        UserSession.token == session_token,
-        UserSession.expires_at > datetime.utcnow()
-    ).first()
+    now = datetime.utcnow()
+
+    cached = await _get_cached_session(session_token)
+    if cached:
+        user_id, email, expires_at = cached
+        if expires_at > now:
+            return CurrentUser(id=user_id, email=email)
 
-    if not session:
+    row = (await db.execute(
+        select(User.id, User.email, UserSession.expires_at)
+        .join(UserSession, UserSession.user_id == User.id)
+        .where(UserSession.token == session_token, UserSession.expires_at > now)
+    )).first()
+
+    if not row:
         return None
 
-    return db.query(User).filter(User.id == session.user_id).first()
+    await _cache_session(session_token, row.id, row.email, row.expires_at)
+
+    return CurrentUser(id=row.id, email=row.email)
 
 
-def require_auth(request: Request, db: Session = Depends(get_db)) -> User:
+async def require_auth(request: Request, db: AsyncSession = Depends(get_async_db)) -> CurrentUser:
     """Require authentication - raises 401 if not authenticated."""
-    user = get_current_user(request, db)
+    user = await get_current_user(request, db)
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     return user
@@ -80,11 +192,13 @@ def require_auth(request: Request, db: Session = Depends(get_db)) -> User:
 async def register(
     request: RegisterRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user account."""
     # Check if email already exists
-    existing = db.query(User).filter(User.email == request.email.lower()).first()
+    existing = (await db.execute(
+        select(User.id).where(User.email == request.email.lower())
+    )).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
@@ -96,10 +210,9 @@ async def register(
     user = User(
         id=str(uuid.uuid4()),
         email=request.email.lower(),
-        password_hash=hash_password(request.password),
+        password_hash=await hash_password_async(request.password),
         created_at=datetime.utcnow()
     )
-    db.add(user)
 
     # Create session
     session_token = create_session_token()
@@ -110,8 +223,11 @@ async def register(
         expires_at=datetime.utcnow() + timedelta(days=SESSION_EXPIRY_DAYS),
         created_at=datetime.utcnow()
     )
-    db.add(session)
-    db.commit()
+
+    # Insert user and session in a single transaction
+    db.add_all([user, session])
+    await db.commit()
+    await _cache_session(session_token, user.id, user.email, session.expires_at)
 
     # Set session cookie
     response.set_cookie(
@@ -133,12 +249,18 @@ async def register(
 async def login(
     request: LoginRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login with email and password."""
-    user = db.query(User).filter(User.email == request.email.lower()).first()
+    user = (await db.execute(
+        select(User.id, User.email, User.password_hash).where(User.email == request.email.lower())
+    )).first()
 
-    if not user or not verify_password(request.password, user.password_hash):
+    # Always run bcrypt (off the event loop) to avoid leaking which emails exist
+    password_hash = user.password_hash if user else _DUMMY_PASSWORD_HASH
+    password_ok = await verify_password_async(request.password, password_hash)
+
+    if not user or not password_ok:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     # Create new session
@@ -151,7 +273,8 @@ async def login(
         created_at=datetime.utcnow()
     )
     db.add(session)
-    db.commit()
+    await db.commit()
+    await _cache_session(session_token, user.id, user.email, session.expires_at)
 
     # Set session cookie
     response.set_cookie(
@@ -173,15 +296,18 @@ async def login(
 async def logout(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Logout and clear session."""
     session_token = request.cookies.get("session_token")
 
     if session_token:
-        # Delete session from database
-        db.query(UserSession).filter(UserSession.token == session_token).delete()
-        db.commit()
+        # Delete from the database first so a concurrent lookup can't find
+        # the row again and re-cache it after the eviction below
+        await db.execute(delete(UserSession).where(UserSession.token == session_token))
+        await db.commit()
+
+        await _forget_session(session_token)
 
     # Clear cookie
     response.delete_cookie(key="session_token")
@@ -192,10 +318,10 @@ async def logout(
 @router.get("/me")
 async def get_me(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current authenticated user."""
-    user = get_current_user(request, db)
+    user = await get_current_user(request, db)
 
     if not user:
         return {"user": None}
@@ -16,6 +16,24 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 
+# Maximum number of concurrent LLM requests (keeps bursts under the provider RPM limit).
+# Enforced per process, so divide the provider budget by the number of workers
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "5"))
+
+# Per-request LLM timeout; set explicitly so the shared HTTP client's 30s default doesn't apply
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+
+# How long identical LLM prompts are served from the response cache (0 disables it)
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+
+# How long a completed digest is reused for identical research requests (0 disables it)
+DIGEST_CACHE_TTL_SECONDS = int(os.getenv("DIGEST_CACHE_TTL_SECONDS", "3600"))
+
+# Search result cache (ArXiv/Tavily). Uses Redis when REDIS_URL is set,
+# otherwise an in-process cache. 0 disables it.
+REDIS_URL = os.getenv("REDIS_URL", "")
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "600"))
+
 # LangSmith Observability (optional)
 # LangChain reads these directly from environment variables
 # We set them explicitly here to ensure they're available
@@ -1,31 +1,96 @@
-from sqlalchemy import create_engine
+import asyncio
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from backend.config import DATABASE_URL
 
+
+def _async_database_url(url: str) -> str:
+    """Map a plain database URL onto its async driver."""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+ASYNC_DATABASE_URL = _async_database_url(DATABASE_URL)
+
+# Connection pool settings for server databases: room for bursts of
+# concurrent requests, health checks on checkout, and periodic recycling
+# so idle connections aren't dropped by the server or a proxy
+POOL_OPTIONS = {
+    "pool_size": 20,
+    "max_overflow": 10,
+    "pool_timeout": 30,
+    "pool_pre_ping": True,
+    "pool_recycle": 3600
+}
+
+
+def _json_serializer(value) -> str:
+    """Encode JSON columns with orjson."""
+    return orjson.dumps(value).decode("utf-8")
+
+
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    **({} if "sqlite" in ASYNC_DATABASE_URL else POOL_OPTIONS)
 )
 
+if "sqlite" in ASYNC_DATABASE_URL:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL with relaxed fsync so commits don't block readers or stall on disk."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 # Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database sessions."""
-    db = SessionLocal()
+async def get_async_db():
+    """Dependency for getting async database sessions."""
+    db = AsyncSessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        # Always return the connection to the pool, even when the handler
+        # raises (e.g. HTTPException from an ownership check)
+        await db.close()
+
 
+async def init_db(attempts: int = 5):
+    """
+    Initialize database tables.
 
-def init_db():
-    """Initialize database tables."""
+    Each worker process runs this on startup. On a fresh database several
+    workers can try to create the same table at once; the loser gets an
+    "already exists" error, so retry and let create_all's existence check
+    skip what the others created.
+    """
     from backend import models  # Import models to register them
-    Base.metadata.create_all(bind=engine)
+    for attempt in range(1, attempts + 1):
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            return
+        except DBAPIError:
+            if attempt == attempts:
+                raise
+            await asyncio.sleep(0.1 * attempt)
@@ -4,18 +4,51 @@ Research Lens - FastAPI Application
 Main entry point for the Research Lens backend API.
 """
 
+import logging
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
+from secrets import token_urlsafe
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 
-from backend.database import engine, Base
+from backend.database import init_db
 from backend.auth import router as auth_router
 from backend.routes import router as api_router
 from backend.config import FRONTEND_URL
+from backend.services.arxiv import arxiv_service
+from backend.services.http_client import close_http_client
+from backend.services.redis_client import redis_client
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Startup / Shutdown
+# =============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and HTTP clients, and close them on shutdown."""
+    logger.info("Creating database tables...")
+    await init_db()
+    logger.info("Database ready")
+    await arxiv_service.startup()
+
+    yield
+
+    await arxiv_service.shutdown()
+    await close_http_client()
+    if redis_client:
+        await redis_client.aclose()
 
 
 # =============================================================================
@@ -25,7 +58,9 @@ from backend.config import FRONTEND_URL
 app = FastAPI(
     title="Research Lens API",
     description="AI-powered research aggregation combining ArXiv papers and web articles",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 
@@ -46,15 +81,17 @@ app.add_middleware(
 @app.middleware("http")
 async def session_middleware(request: Request, call_next):
     """Ensure anonymous users have a session ID."""
+    # Static assets don't need session tracking
+    if request.url.path.startswith("/assets/"):
+        return await call_next(request)
+
     response = await call_next(request)
 
     # Set session_id cookie for anonymous tracking
     if "session_id" not in request.cookies:
-        import uuid
-        session_id = str(uuid.uuid4())
         response.set_cookie(
             key="session_id",
-            value=session_id,
+            value=token_urlsafe(22),
             httponly=True,
             secure=False,  # Set to True in production
             samesite="lax",
@@ -64,18 +101,6 @@ async def session_middleware(request: Request, call_next):
     return response
 
 
-# =============================================================================
-# Database Initialization
-# =============================================================================
-
-@app.on_event("startup")
-async def startup():
-    """Initialize database tables on startup."""
-    print("[Research Lens] Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("[Research Lens] Database ready")
-
-
 # =============================================================================
 # Include Routers
 # =============================================================================
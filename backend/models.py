@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index, JSON, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from backend.database import Base
 
@@ -9,6 +10,10 @@ def generate_uuid():
     return str(uuid.uuid4())
 
 
+# Binary JSONB on Postgres, plain JSON elsewhere (e.g. SQLite)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -26,19 +31,27 @@ class SearchHistory(Base):
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
-    session_id = Column(String(255), nullable=True, index=True)
+    session_id = Column(String(255), nullable=True)
     topic = Column(String(500), nullable=False)
     keywords = Column(String(500), nullable=True)
     timeframe_days = Column(Integer, nullable=False)
     paper_count = Column(Integer, nullable=True)
     article_count = Column(Integer, nullable=True)
-    executive_summary = Column(JSON, nullable=True)
-    results = Column(JSON, nullable=True)
+    executive_summary = Column(JSONType, nullable=True)
+    results = Column(JSONType, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="search_history")
 
+    # History listings filter by owner and sort newest first; the digest
+    # cache looks up recent rows by case-insensitive topic
+    __table_args__ = (
+        Index("ix_search_history_user_created", "user_id", created_at.desc()),
+        Index("ix_search_history_session_created", "session_id", created_at.desc()),
+        Index("ix_search_history_topic_lookup", func.lower(topic), timeframe_days, created_at),
+    )
+
 
 class UserSession(Base):
     """User authentication sessions."""
@@ -52,3 +65,12 @@ class UserSession(Base):
 
     # Relationship
     user = relationship("User", backref="sessions")
+
+
+class LLMCacheEntry(Base):
+    """Cached LLM responses keyed by a hash of the prompt."""
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
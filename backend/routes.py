@@ -4,19 +4,25 @@ API routes for Research Lens.
 Provides research endpoint and history management.
 """
 
-import uuid
+import hashlib
+import logging
 from datetime import datetime, timezone
+from secrets import token_urlsafe
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database import get_db
+from backend.database import AsyncSessionLocal, get_async_db
 from backend.models import SearchHistory, User
-from backend.schemas import SearchRequest, DigestResponse, HistoryItem
-from backend.auth import get_current_user
+from backend.schemas import SearchRequest, DigestResponse, HistoryItem, HistoryResponse
+from backend.auth import CurrentUser, get_current_user
 from backend.agents.research_agent import run_research_agent
 
+logger = logging.getLogger(__name__)
+
 
 router = APIRouter(prefix="/api", tags=["research"])
 
@@ -25,11 +31,22 @@ router = APIRouter(prefix="/api", tags=["research"])
 # Research Endpoint
 # =============================================================================
 
+async def _persist_history(entry: SearchHistory):
+    """Save a history entry after the response has been sent."""
+    try:
+        async with AsyncSessionLocal() as session:
+            session.add(entry)
+            await session.commit()
+    except Exception as e:
+        logger.error("Failed to save search history: %s", e)
+
+
 @router.post("/research", response_model=DigestResponse)
 async def research(
     request: SearchRequest,
     http_request: Request,
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Execute research agent to fetch papers and articles.
@@ -37,7 +54,7 @@ async def research(
     Returns papers from ArXiv and articles from Tavily with AI-generated
     executive summaries.
     """
-    print(f"[API] Research request: topic='{request.topic}', days={request.timeframe_days}")
+    logger.info("Research request: topic='%s', days=%d", request.topic, request.timeframe_days)
 
     try:
         # Run the research agent
@@ -48,16 +65,15 @@ async def research(
         )
 
         # Get current user (optional)
-        user = get_current_user(http_request, db)
+        user = await get_current_user(http_request, db)
 
         # Get session ID from cookie for anonymous users
         session_id = http_request.cookies.get("session_id")
         if not session_id and not user:
-            session_id = str(uuid.uuid4())
+            session_id = token_urlsafe(22)  # Same format as the middleware cookie
 
-        # Save to history
+        # Build the history entry
         history_entry = SearchHistory(
-            id=str(uuid.uuid4()),
             user_id=user.id if user else None,
             session_id=session_id if not user else None,
             topic=request.topic,
@@ -70,15 +86,17 @@ async def research(
                 "articles": result.get("articles", {}).get("executiveSummary", "")
             },
             results=result,
-            created_at=datetime.now(timezone.utc)
+            created_at=datetime.utcnow()  # Naive UTC, matching the DateTime column
         )
-        db.add(history_entry)
-        db.commit()
+        # Write history off the critical path so the digest isn't held up
+        background_tasks.add_task(_persist_history, history_entry)
 
-        return result
+        # The agent already builds the aliased DigestResponse shape, so send
+        # it as-is; response_model stays for the OpenAPI schema only
+        return ORJSONResponse(content=result)
 
     except Exception as e:
-        print(f"[API] Research error: {e}")
+        logger.exception("Research error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -86,28 +104,114 @@ async def research(
 # History Endpoints
 # =============================================================================
 
+def _ownership_clause(user: Optional[CurrentUser], session_id: Optional[str]):
+    """
+    Build the WHERE clause restricting history rows to the caller.
+
+    Returns None when the caller has neither an account nor a session, in
+    which case they own nothing. Rows owned by someone else are reported as
+    not found rather than forbidden.
+    """
+    if user:
+        return SearchHistory.user_id == user.id
+    if session_id:
+        return SearchHistory.session_id == session_id
+    return None
+
+
+# Page sizes used when the client doesn't pass a limit (the history page
+# requests a single unpaged list)
+HISTORY_USER_PAGE_SIZE = 50
+HISTORY_SESSION_PAGE_SIZE = 20
+
+# The listing must revalidate so new and deleted searches show up at once;
+# a stored result never changes, so it can be reused briefly without asking
+HISTORY_LIST_CACHE_CONTROL = "private, no-cache"
+HISTORY_ITEM_CACHE_CONTROL = "private, max-age=30"
+
+
+def _etag(*parts) -> str:
+    """Build a quoted ETag from the values that identify a response's content."""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 response carrying the validators."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
 @router.get("/history")
 async def get_history(
     request: Request,
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    before: Optional[datetime] = Query(None),
+    before_id: Optional[str] = Query(None, alias="beforeId"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get search history for the current user or session."""
-    user = get_current_user(request, db)
+    """
+    Get a page of search history for the current user or session.
 
-    if user:
-        # Get history for logged-in user
-        history = db.query(SearchHistory).filter(
-            SearchHistory.user_id == user.id
-        ).order_by(SearchHistory.created_at.desc()).limit(50).all()
-    else:
-        # Get history for anonymous session
-        session_id = request.cookies.get("session_id")
-        if not session_id:
-            return {"items": []}
-
-        history = db.query(SearchHistory).filter(
-            SearchHistory.session_id == session_id
-        ).order_by(SearchHistory.created_at.desc()).limit(20).all()
+    Pages are keyed on (created_at, id): pass the previous response's
+    nextBefore/nextBeforeId to continue, so deep pages cost the same as
+    the first one instead of skipping rows with OFFSET.
+    """
+    user = await get_current_user(request, db)
+    owner = _ownership_clause(user, request.cookies.get("session_id"))
+    if owner is None:
+        return HistoryResponse(items=[])
+
+    if limit is None:
+        limit = HISTORY_USER_PAGE_SIZE if user else HISTORY_SESSION_PAGE_SIZE
+
+    if before is not None and before.tzinfo is not None:
+        # created_at is naive UTC; asyncpg rejects aware values against it
+        before = before.astimezone(timezone.utc).replace(tzinfo=None)
+
+    # Row count and newest timestamp change whenever a search is added or
+    # deleted, so they version the listing without loading any rows
+    version = (await db.execute(
+        select(func.count(), func.max(SearchHistory.created_at)).where(owner)
+    )).one()
+    etag = _etag(version[0], version[1], limit, before, before_id)
+    if _etag_matches(request, etag):
+        return _not_modified(etag, HISTORY_LIST_CACHE_CONTROL)
+
+    # Only the listing columns - skip the large results/summary JSON blobs
+    stmt = select(
+        SearchHistory.id,
+        SearchHistory.topic,
+        SearchHistory.keywords,
+        SearchHistory.timeframe_days,
+        SearchHistory.paper_count,
+        SearchHistory.article_count,
+        SearchHistory.created_at
+    ).where(owner)
+
+    if before is not None:
+        if before_id:
+            # id breaks ties between searches saved in the same instant
+            stmt = stmt.where(
+                tuple_(SearchHistory.created_at, SearchHistory.id) < tuple_(before, before_id)
+            )
+        else:
+            stmt = stmt.where(SearchHistory.created_at < before)
+
+    result = await db.execute(
+        stmt.order_by(SearchHistory.created_at.desc(), SearchHistory.id.desc()).limit(limit)
+    )
+    history = result.all()
 
     items = [
         HistoryItem(
@@ -122,61 +226,77 @@ async def get_history(
         for h in history
     ]
 
-    return {"items": items}
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = HISTORY_LIST_CACHE_CONTROL
+
+    last = history[-1] if len(history) == limit and history[-1].created_at else None
+    return HistoryResponse(
+        items=items,
+        next_before=last.created_at.isoformat() if last else None,
+        next_before_id=last.id if last else None
+    )
 
 
 @router.get("/history/{history_id}")
 async def get_history_item(
     history_id: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific search result from history."""
-    user = get_current_user(request, db)
-    session_id = request.cookies.get("session_id")
+    user = await get_current_user(request, db)
+    owner = _ownership_clause(user, request.cookies.get("session_id"))
+    if owner is None:
+        raise HTTPException(status_code=404, detail="History item not found")
 
-    history = db.query(SearchHistory).filter(SearchHistory.id == history_id).first()
+    # Check ownership and the validator first so a repeat poll never loads the results blob
+    row = (await db.execute(
+        select(SearchHistory.created_at).where(SearchHistory.id == history_id, owner)
+    )).first()
 
-    if not history:
+    if not row:
         raise HTTPException(status_code=404, detail="History item not found")
 
-    # Verify ownership
-    if user:
-        if history.user_id != user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-    else:
-        if history.session_id != session_id:
-            raise HTTPException(status_code=403, detail="Access denied")
+    etag = _etag(history_id, row.created_at)
+    if _etag_matches(request, etag):
+        return _not_modified(etag, HISTORY_ITEM_CACHE_CONTROL)
+
+    results = (await db.execute(
+        select(SearchHistory.results).where(SearchHistory.id == history_id)
+    )).scalar_one_or_none()
+
+    if results is None:
+        # Deleted between the two queries
+        raise HTTPException(status_code=404, detail="History item not found")
 
-    return history.results
+    # Stored results are already a JSON-ready dict; skip re-encoding via jsonable_encoder
+    return ORJSONResponse(
+        content=results,
+        headers={"ETag": etag, "Cache-Control": HISTORY_ITEM_CACHE_CONTROL}
+    )
 
 
 @router.delete("/history/{history_id}")
 async def delete_history_item(
     history_id: str,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a search from history."""
-    user = get_current_user(request, db)
-    session_id = request.cookies.get("session_id")
+    user = await get_current_user(request, db)
+    owner = _ownership_clause(user, request.cookies.get("session_id"))
+    if owner is None:
+        raise HTTPException(status_code=404, detail="History item not found")
 
-    history = db.query(SearchHistory).filter(SearchHistory.id == history_id).first()
+    # Ownership is part of the WHERE clause, so check and delete are one statement
+    result = await db.execute(
+        delete(SearchHistory).where(SearchHistory.id == history_id, owner)
+    )
+    await db.commit()
 
-    if not history:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="History item not found")
 
-    # Verify ownership
-    if user:
-        if history.user_id != user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-    else:
-        if history.session_id != session_id:
-            raise HTTPException(status_code=403, detail="Access denied")
-
-    db.delete(history)
-    db.commit()
-
     return {"success": True}
 
 
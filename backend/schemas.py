@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -12,8 +12,8 @@ class SearchRequest(BaseModel):
     keywords: Optional[str] = Field(None, description="Optional keywords")
     timeframe_days: int = Field(default=7, ge=1, le=30, alias="timeframeDays")
 
-    class Config:
-        populate_by_name = True
+    # Stored history rows must match the digest cache's normalized keys
+    model_config = ConfigDict(populate_by_name=True, str_strip_whitespace=True)
 
 
 class RegisterRequest(BaseModel):
@@ -35,8 +35,7 @@ class PaperSummary(BaseModel):
     proposed_solution: str = Field(alias="proposedSolution")
     challenges: str
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Paper(BaseModel):
@@ -49,8 +48,7 @@ class Paper(BaseModel):
     categories: List[str]
     summary: PaperSummary
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class Article(BaseModel):
@@ -60,8 +58,7 @@ class Article(BaseModel):
     source: str
     published_date: Optional[str] = Field(None, alias="publishedDate")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class PapersSection(BaseModel):
@@ -69,8 +66,7 @@ class PapersSection(BaseModel):
     count: int
     items: List[Paper]
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ArticlesSection(BaseModel):
@@ -78,8 +74,7 @@ class ArticlesSection(BaseModel):
     count: int
     items: List[Article]
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class DigestResponse(BaseModel):
@@ -90,8 +85,7 @@ class DigestResponse(BaseModel):
     articles: ArticlesSection
     warning: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class UserResponse(BaseModel):
@@ -99,8 +93,7 @@ class UserResponse(BaseModel):
     email: str
     created_at: Optional[str] = Field(None, alias="createdAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class AuthResponse(BaseModel):
@@ -109,8 +102,7 @@ class AuthResponse(BaseModel):
     session_id: Optional[str] = Field(None, alias="sessionId")
     message: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class HistoryItem(BaseModel):
@@ -122,9 +114,13 @@ class HistoryItem(BaseModel):
     article_count: Optional[int] = Field(None, alias="articleCount")
     created_at: Optional[str] = Field(None, alias="createdAt")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class HistoryResponse(BaseModel):
     items: List[HistoryItem]
+    # Keyset cursor for the next page; None on the last page
+    next_before: Optional[str] = Field(None, alias="nextBefore")
+    next_before_id: Optional[str] = Field(None, alias="nextBeforeId")
+
+    model_config = ConfigDict(populate_by_name=True)
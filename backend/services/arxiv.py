@@ -1,8 +1,19 @@
+import logging
 import httpx
-import xml.etree.ElementTree as ET
+from lxml import etree
+from contextlib import aclosing
 from datetime import datetime, timedelta
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+from dataclasses import asdict, dataclass
+
+from backend.services.http_client import get_http_client
+from backend.services.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
+
+
+# Clark-notation tag for the streaming parser's entry filter
+ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
 
 
 @dataclass
@@ -22,6 +33,39 @@ class ArxivService:
 
     BASE_URL = "https://export.arxiv.org/api/query"
 
+    # Entry field lookups, compiled once instead of per entry
+    _NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+    _XP_PUBLISHED = etree.XPath("string(atom:published)", namespaces=_NS)
+    _XP_ID = etree.XPath("string(atom:id)", namespaces=_NS)
+    _XP_TITLE = etree.XPath("string(atom:title)", namespaces=_NS)
+    _XP_ABSTRACT = etree.XPath("string(atom:summary)", namespaces=_NS)
+    # Plain strings, so results don't keep cleared entries alive
+    _XP_AUTHORS = etree.XPath("atom:author/atom:name/text()", namespaces=_NS, smart_strings=False)
+    _XP_CATS = etree.XPath("atom:category/@term", namespaces=_NS, smart_strings=False)
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        # Falls back to the shared pooled client when none is injected
+        # and startup() hasn't been called (e.g. in standalone scripts)
+        self._client = client
+        self._owns_client = False
+
+    async def startup(self):
+        """Open a dedicated keep-alive connection pool to ArXiv."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+            self._owns_client = True
+
+    async def shutdown(self):
+        """Close the connection pool opened by startup()."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._owns_client = False
+
     async def search_papers(
         self,
         topic: str,
@@ -29,6 +73,23 @@ class ArxivService:
         days: int = 7
     ) -> List[ArxivPaper]:
         """Search ArXiv for papers matching the topic."""
+        return [paper async for paper in self.stream_papers(topic, keywords, days)]
+
+    async def stream_papers(
+        self,
+        topic: str,
+        keywords: Optional[str] = None,
+        days: int = 7,
+        limit: int = 10
+    ) -> AsyncIterator[ArxivPaper]:
+        """
+        Yield papers matching the topic as their entries arrive.
+
+        The response body is parsed incrementally, so callers can start
+        working on the first papers before the download has finished.
+        Request and parse failures are logged and re-raised so the caller
+        can report them.
+        """
         try:
             # Build search query
             search_query = f"all:{topic}"
@@ -41,95 +102,109 @@ class ArxivService:
             # Default to CS categories
             search_query += " AND (cat:cs.AI OR cat:cs.LG OR cat:cs.CL OR cat:cs.CV OR cat:cs.RO OR cat:cs.NE)"
 
-            # Calculate cutoff date
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Restrict to the timeframe server-side so only in-window papers are returned
+            now = datetime.utcnow()
+            start = (now - timedelta(days=days)).strftime("%Y%m%d%H%M")
+            end = now.strftime("%Y%m%d%H%M")
+            search_query += f" AND submittedDate:[{start} TO {end}]"
+
+            # ArXiv dates are ISO-8601 UTC ("...Z"), so a plain string compare
+            # against this cutoff orders them correctly without datetime parsing
+            cutoff_str = (now - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
 
             params = {
                 "search_query": search_query,
                 "start": "0",
-                "max_results": "50",
+                "max_results": "15",
                 "sortBy": "submittedDate",
                 "sortOrder": "descending"
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.BASE_URL, params=params, timeout=30.0)
-                response.raise_for_status()
+            cache_key = search_cache.key("arxiv", topic, keywords, days, limit)
+            cached = await search_cache.get(cache_key)
+            if cached is not None:
+                for item in cached:
+                    yield ArxivPaper(**item)
+                return
+
+            papers = []
+            async with aclosing(self._fetch_entries(params, cutoff_str)) as entries:
+                async for paper in entries:
+                    papers.append(paper)
+                    yield paper
 
-            # Parse XML response
-            papers = self._parse_response(response.text, cutoff_date)
+                    # Return up to `limit` papers
+                    if len(papers) >= limit:
+                        break
 
-            # Return up to 10 papers
-            return papers[:10]
+            await search_cache.set(cache_key, [asdict(p) for p in papers])
+
+        except Exception as e:
+            logger.error("Error fetching papers: %s", e)
+            raise
+
+    async def _fetch_entries(self, params: dict, cutoff_str: str) -> AsyncIterator[ArxivPaper]:
+        """Stream the ArXiv response and yield each entry as it is parsed."""
+        parser = etree.XMLPullParser(events=("end",), tag=ATOM_ENTRY)
+        client = self._client or get_http_client()
+
+        async with client.stream("GET", self.BASE_URL, params=params, timeout=30.0) as response:
+            response.raise_for_status()
+
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+
+                for _, entry in parser.read_events():
+                    paper = self._parse_entry(entry, cutoff_str)
+
+                    # Free processed entries so memory stays flat
+                    entry.clear()
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
+
+                    if paper is not None:
+                        yield paper
+
+    def _parse_entry(self, entry: etree._Element, cutoff_str: str) -> Optional[ArxivPaper]:
+        """Parse a single ArXiv Atom entry, skipping ones published before the cutoff."""
+        try:
+            # Get published date; the query already bounds it, this is a cheap
+            # guard that runs before any other field is parsed
+            published_str = self._XP_PUBLISHED(entry)
+            if published_str < cutoff_str:
+                return None
+
+            # Extract ID from URL
+            id_url = self._XP_ID(entry)
+            if not id_url:
+                return None
+            arxiv_id = id_url.split("/")[-1]
+
+            # Get title
+            title = " ".join(self._XP_TITLE(entry).split())  # Normalize whitespace
+
+            # Get authors
+            authors_str = ", ".join(self._XP_AUTHORS(entry))
+
+            # Get abstract
+            abstract = " ".join(self._XP_ABSTRACT(entry).split())  # Normalize whitespace
+
+            # Get categories
+            categories = [term for term in self._XP_CATS(entry) if term]
+
+            return ArxivPaper(
+                id=arxiv_id,
+                title=title,
+                authors=authors_str,
+                abstract=abstract,
+                arxiv_url=f"https://arxiv.org/abs/{arxiv_id}",
+                published_date=published_str,
+                categories=categories
+            )
 
         except Exception as e:
-            print(f"[ArxivService] Error fetching papers: {e}")
-            return []
-
-    def _parse_response(self, xml_text: str, cutoff_date: datetime) -> List[ArxivPaper]:
-        """Parse ArXiv XML response."""
-        papers = []
-
-        # Define namespaces
-        namespaces = {
-            "atom": "http://www.w3.org/2005/Atom",
-            "arxiv": "http://arxiv.org/schemas/atom"
-        }
-
-        root = ET.fromstring(xml_text)
-
-        for entry in root.findall("atom:entry", namespaces):
-            try:
-                # Parse published date
-                published_str = entry.find("atom:published", namespaces).text
-                published_date = datetime.fromisoformat(published_str.replace("Z", "+00:00"))
-
-                # Filter by date
-                if published_date.replace(tzinfo=None) < cutoff_date:
-                    continue
-
-                # Extract ID from URL
-                id_url = entry.find("atom:id", namespaces).text
-                arxiv_id = id_url.split("/")[-1]
-
-                # Get title
-                title = entry.find("atom:title", namespaces).text
-                title = " ".join(title.split())  # Normalize whitespace
-
-                # Get authors
-                authors = []
-                for author in entry.findall("atom:author", namespaces):
-                    name = author.find("atom:name", namespaces).text
-                    authors.append(name)
-                authors_str = ", ".join(authors)
-
-                # Get abstract
-                abstract = entry.find("atom:summary", namespaces).text
-                abstract = " ".join(abstract.split())  # Normalize whitespace
-
-                # Get categories
-                categories = []
-                for category in entry.findall("atom:category", namespaces):
-                    term = category.get("term")
-                    if term:
-                        categories.append(term)
-
-                paper = ArxivPaper(
-                    id=arxiv_id,
-                    title=title,
-                    authors=authors_str,
-                    abstract=abstract,
-                    arxiv_url=f"https://arxiv.org/abs/{arxiv_id}",
-                    published_date=published_str,
-                    categories=categories
-                )
-                papers.append(paper)
-
-            except Exception as e:
-                print(f"[ArxivService] Error parsing entry: {e}")
-                continue
-
-        return papers
+            logger.warning("Error parsing entry: %s", e)
+            return None
 
 
 # Singleton instance
@@ -0,0 +1,34 @@
+"""
+Shared HTTP client.
+
+A single connection-pooled httpx.AsyncClient is reused by the ArXiv service
+and the OpenAI LLM client, so TCP/TLS sessions are kept alive across
+requests and concurrent calls share connections.
+"""
+
+from typing import Optional
+
+import httpx
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
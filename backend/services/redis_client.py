@@ -0,0 +1,13 @@
+"""
+Shared Redis connection.
+
+Redis is optional: when REDIS_URL is not configured `redis_client` is None
+and callers fall back to in-process caches and the database.
+"""
+
+import redis.asyncio as redis
+
+from backend.config import REDIS_URL
+
+
+redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
@@ -0,0 +1,66 @@
+"""
+Short-lived cache for upstream search results (ArXiv, Tavily).
+
+Uses Redis when REDIS_URL is configured so results are shared across
+workers; otherwise falls back to an in-process TTL cache. Cache errors are
+logged and treated as misses so searches never fail because of the cache.
+"""
+
+import logging
+import hashlib
+from typing import List, Optional
+
+import orjson
+from cachetools import TTLCache
+
+from backend.config import SEARCH_CACHE_TTL_SECONDS
+from backend.services.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """Cache of search results stored as lists of plain dicts."""
+
+    def __init__(self):
+        self.redis = redis_client
+        self._local: TTLCache = TTLCache(maxsize=256, ttl=max(SEARCH_CACHE_TTL_SECONDS, 1))
+
+    @staticmethod
+    def key(namespace: str, *parts) -> str:
+        """Build a cache key from a namespace and the search parameters."""
+        raw = "|".join("" if p is None else str(p) for p in parts)
+        return f"{namespace}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[List[dict]]:
+        """Return cached results for a key, or None on a miss."""
+        if SEARCH_CACHE_TTL_SECONDS <= 0:
+            return None
+
+        if not self.redis:
+            return self._local.get(key)
+
+        try:
+            cached = await self.redis.get(key)
+            return orjson.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning("Get error: %s", e)
+            return None
+
+    async def set(self, key: str, items: List[dict]) -> None:
+        """Store results for a key with the configured TTL."""
+        if SEARCH_CACHE_TTL_SECONDS <= 0:
+            return
+
+        if not self.redis:
+            self._local[key] = items
+            return
+
+        try:
+            await self.redis.set(key, orjson.dumps(items), ex=SEARCH_CACHE_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("Set error: %s", e)
+
+
+# Singleton instance
+search_cache = SearchCache()
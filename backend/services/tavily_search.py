@@ -1,10 +1,14 @@
+import logging
 import uuid
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from urllib.parse import urlparse
 
 from tavily import AsyncTavilyClient
 from backend.config import TAVILY_API_KEY
+from backend.services.search_cache import search_cache
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -30,9 +34,14 @@ class TavilyService:
         days: int = 7,
         keywords: Optional[str] = None
     ) -> List[Article]:
-        """Search for articles related to the topic."""
+        """
+        Search for articles related to the topic.
+
+        Returns an empty list when Tavily isn't configured; search failures
+        are logged and re-raised so the caller can report them.
+        """
         if not self.client:
-            print("[TavilyService] No API key configured")
+            logger.warning("No API key configured")
             return []
 
         try:
@@ -44,7 +53,12 @@ class TavilyService:
             else:
                 search_depth = "advanced"
 
-            print(f"[TavilyService] Searching for: '{query}'")
+            cache_key = search_cache.key("tavily", topic, keywords, days)
+            cached = await search_cache.get(cache_key)
+            if cached is not None:
+                return [Article(**item) for item in cached]
+
+            logger.info("Searching for: '%s'", query)
 
             response = await self.client.search(
                 query=query,
@@ -59,12 +73,13 @@ class TavilyService:
                 article = self._transform_result(result)
                 articles.append(article)
 
-            print(f"[TavilyService] Found {len(articles)} articles")
+            logger.info("Found %d articles", len(articles))
+            await search_cache.set(cache_key, [asdict(a) for a in articles])
             return articles
 
         except Exception as e:
-            print(f"[TavilyService] Search error: {e}")
-            return []
+            logger.error("Search error: %s", e)
+            raise
 
     def _transform_result(self, result: dict) -> Article:
         """Transform Tavily result to Article."""
@@ -6,9 +6,17 @@ Usage:
     python run.py                  # Run with default settings
     python run.py --port 8000      # Run on custom port
     python run.py --no-reload      # Disable auto-reload
+    python run.py --no-reload --workers 4
+
+With several workers, per-process limits and caches multiply: the LLM
+concurrency cap becomes workers x LLM_MAX_CONCURRENCY, and each worker has
+its own database pool. Set REDIS_URL so login sessions and search results
+are shared between workers.
 """
 
 import argparse
+from importlib.util import find_spec
+
 import uvicorn
 
 from backend.config import PORT, DEBUG
@@ -19,8 +27,14 @@ def main():
     parser.add_argument("--port", type=int, default=PORT, help="Port to run on")
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--no-reload", action="store_true", help="Disable auto-reload")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (ignored with auto-reload)")
     args = parser.parse_args()
 
+    reload = not args.no_reload and DEBUG
+    # The reloader only supports a single process; each worker imports the
+    # app itself, so the DB engine and its pool are per worker
+    workers = 1 if reload else max(args.workers, 1)
+
     print(f"""
 ╔═══════════════════════════════════════════════════════════╗
 ║                    Research Lens                          ║
@@ -36,7 +50,11 @@ def main():
         "backend.main:app",
         host=args.host,
         port=args.port,
-        reload=not args.no_reload and DEBUG,
+        reload=reload,
+        workers=workers,
+        # uvloop has no Windows build; fall back to the stock loop there
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools",
         log_level="info"
     )
 